@@ -1,10 +1,31 @@
 """MCP Network Common - Shared utilities for MCP network device servers."""
 
+from mcp_network_common.config_diff import config_delta, negate_line, parse_config
+from mcp_network_common.coordination import (
+    CoordinatorServer,
+    LocalCoordinator,
+    SocketCoordinator,
+    get_coordinator,
+)
 from mcp_network_common.http import create_http_client, handle_http_errors
+from mcp_network_common.http_cache import CachingTransport, ResponseCache
 from mcp_network_common.inventory import get_device, load_inventory
 from mcp_network_common.logging import setup_logger
-from mcp_network_common.response import error_response, json_dumps, ok_response
-from mcp_network_common.ssh import create_scrapli_conn, handle_ssh_errors
+from mcp_network_common.response import (
+    NdjsonResponse,
+    error_response,
+    json_dumps,
+    json_line,
+    ok_response,
+    stream_responses,
+)
+from mcp_network_common.session import SessionTracker, get_session_tracker, open_device
+from mcp_network_common.ssh import (
+    KnownHostsStore,
+    create_scrapli_conn,
+    get_known_hosts_store,
+    handle_ssh_errors,
+)
 from mcp_network_common.validation import CommandValidator
 
 __all__ = [
@@ -14,9 +35,26 @@ __all__ = [
     "ok_response",
     "error_response",
     "json_dumps",
+    "json_line",
+    "NdjsonResponse",
+    "stream_responses",
     "create_scrapli_conn",
     "handle_ssh_errors",
+    "KnownHostsStore",
+    "get_known_hosts_store",
     "create_http_client",
     "handle_http_errors",
+    "CachingTransport",
+    "ResponseCache",
     "CommandValidator",
+    "config_delta",
+    "parse_config",
+    "negate_line",
+    "open_device",
+    "SessionTracker",
+    "get_session_tracker",
+    "LocalCoordinator",
+    "SocketCoordinator",
+    "CoordinatorServer",
+    "get_coordinator",
 ]
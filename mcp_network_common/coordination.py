@@ -0,0 +1,373 @@
+"""Shared per-device limits and caches across worker processes.
+
+Several worker processes of one MCP server each hold their own session
+budgets, rate limits and caches. Pointing them at one coordinator over a
+local Unix socket (``MCP_COORDINATOR_SOCKET``) makes those limits global.
+Without it, ``get_coordinator`` returns an in-process ``LocalCoordinator``.
+
+Run the coordinator next to the workers with::
+
+    mcp-coordinator /run/mcp/coordinator.sock
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Any
+
+from mcp_network_common.logging import setup_logger
+from mcp_network_common.response import json_line
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCoordinator:
+    """In-process semaphores, token buckets and a TTL cache.
+
+    This is the fallback when no coordinator socket is configured, and also
+    the state a ``CoordinatorServer`` shares between its clients.
+
+    Args:
+        max_cache_entries: Maximum number of cached values (LRU eviction).
+    """
+
+    def __init__(self, max_cache_entries: int = 1024) -> None:
+        self.max_cache_entries = max_cache_entries
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._cache: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def acquire(self, key: str, limit: int) -> None:
+        """Wait (FIFO) until one of *limit* slots for *key* is free, then take it.
+
+        The limit is fixed the first time *key* is seen.
+        """
+        sem = self._semaphores.get(key)
+        if sem is None:
+            sem = self._semaphores[key] = asyncio.Semaphore(limit)
+        await sem.acquire()
+
+    async def release(self, key: str) -> None:
+        """Return a slot taken with ``acquire``."""
+        self._semaphores[key].release()
+
+    async def reserve(self, key: str, rate: float, burst: int = 1) -> float:
+        """Take a token from *key*'s bucket and return how long to wait for it.
+
+        The bucket refills at *rate* tokens per second up to *burst*. Tokens
+        are reserved even when the bucket is empty, so concurrent callers
+        queue up behind each other instead of retrying.
+        """
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (float(burst), now))
+        tokens = min(float(burst), tokens + (now - updated) * rate) - 1
+        self._buckets[key] = (tokens, now)
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+    async def throttle(self, key: str, rate: float, burst: int = 1) -> None:
+        """Wait until *key*'s rate limit allows one more operation."""
+        delay = await self.reserve(key, rate, burst)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def cache_get(self, key: str) -> Any | None:
+        """Return the cached value for *key*, or ``None`` if missing or expired."""
+        item = self._cache.get(key)
+        if item is None:
+            return None
+        expires, value = item
+        if expires and expires < time.time():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    async def cache_set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Cache *value* (JSON-serializable) under *key* for *ttl* seconds."""
+        self._cache[key] = (time.time() + ttl if ttl else 0.0, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+
+
+class CoordinatorServer:
+    """Serve a ``LocalCoordinator`` to other processes over a Unix socket.
+
+    The protocol is one JSON object per line: requests carry ``id``, ``op``
+    and arguments; replies carry the same ``id`` and ``result`` or ``error``.
+    Slots still held by a client when it disconnects are released, so a
+    crashed worker never leaks a device's vty budget. An exclusive lock on
+    ``{path}.lock`` is held while serving, so a second server on the same
+    path fails to start instead of taking over the socket.
+
+    Args:
+        path: Unix socket path to listen on.
+        state: Shared state; a fresh ``LocalCoordinator`` if omitted.
+    """
+
+    def __init__(self, path: str, state: LocalCoordinator | None = None) -> None:
+        self.path = path
+        self.state = state or LocalCoordinator()
+        self._server: asyncio.AbstractServer | None = None
+        self._lock_fd: int | None = None
+        self._clients: set[asyncio.Task[Any]] = set()
+
+    async def start(self) -> None:
+        """Start listening, replacing a stale socket file if present.
+
+        Raises ``RuntimeError`` if another server holds the lock for *path*.
+        """
+        import fcntl  # POSIX only; the in-process fallback must import anywhere.
+
+        fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            raise RuntimeError(f"A coordinator is already running on {self.path}") from None
+        self._lock_fd = fd
+        try:
+            # Holding the lock proves any existing socket file is stale.
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        except BaseException:
+            self._unlock()
+            raise
+        logger.info("Coordinator listening on %s", self.path)
+
+    def _unlock(self) -> None:
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def close(self) -> None:
+        """Stop listening, disconnect all clients and remove the socket file.
+
+        Clients see the connection drop, so their pending calls fail with
+        ``ConnectionError`` instead of waiting forever.
+        """
+        if self._server is None:
+            return
+        self._server.close()
+        for task in self._clients:
+            task.cancel()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._unlock()
+
+    async def serve_forever(self) -> None:
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        current = asyncio.current_task()
+        assert current is not None
+        self._clients.add(current)
+        held: dict[str, int] = {}
+        pending: set[asyncio.Task[None]] = set()
+        try:
+            while line := await reader.readline():
+                request = json.loads(line)
+                task = asyncio.create_task(self._dispatch(request, writer, held))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+        except (ConnectionError, ValueError) as e:
+            logger.warning("Dropping coordinator client: %s", e)
+        except asyncio.CancelledError:
+            # Server shutdown. This is the connection's top-level task; ending
+            # it cancelled makes asyncio log a traceback from its done callback.
+            pass
+        finally:
+            self._clients.discard(current)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for key, count in held.items():
+                for _ in range(count):
+                    await self.state.release(key)
+            writer.close()
+
+    async def _dispatch(
+        self,
+        request: Any,
+        writer: asyncio.StreamWriter,
+        held: dict[str, int],
+    ) -> None:
+        reply: dict[str, Any] = {"id": request.get("id") if isinstance(request, dict) else None}
+        try:
+            if not isinstance(request, dict):
+                raise TypeError("Request must be a JSON object")
+            op, key = request.get("op"), request.get("key", "")
+            if op == "acquire":
+                await self.state.acquire(key, int(request["limit"]))
+                held[key] = held.get(key, 0) + 1
+                reply["result"] = True
+            elif op == "release":
+                if held.get(key):
+                    held[key] -= 1
+                    await self.state.release(key)
+                reply["result"] = True
+            elif op == "reserve":
+                reply["result"] = await self.state.reserve(
+                    key, float(request["rate"]), int(request.get("burst", 1))
+                )
+            elif op == "cache_get":
+                reply["result"] = await self.state.cache_get(key)
+            elif op == "cache_set":
+                await self.state.cache_set(key, request.get("value"), request.get("ttl"))
+                reply["result"] = True
+            else:
+                reply["error"] = f"Unknown op '{op}'"
+        except Exception as e:
+            # Any failure must still be answered, or the caller waits forever.
+            logger.warning("Coordinator request %r failed: %s", request, e)
+            reply["error"] = str(e) or type(e).__name__
+        if reply["id"] is not None and not writer.is_closing():
+            writer.write(json_line(reply).encode())
+
+
+class SocketCoordinator:
+    """Client for a ``CoordinatorServer``; same interface as ``LocalCoordinator``.
+
+    One connection is opened lazily and shared by all callers in the process.
+
+    Args:
+        path: Unix socket path of the coordinator.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future[Any]] = {}
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+        self._connect_lock: asyncio.Lock | None = None
+
+    async def _connect(self) -> asyncio.StreamWriter:
+        if self._writer is not None and not self._writer.is_closing():
+            return self._writer
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is None or self._writer.is_closing():
+                reader, self._writer = await asyncio.open_unix_connection(self.path)
+                self._reader_task = asyncio.create_task(self._read(reader))
+        return self._writer
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while line := await reader.readline():
+                reply = json.loads(line)
+                future = self._pending.pop(reply.get("id"), None)
+                if future is None or future.done():
+                    continue
+                if "error" in reply:
+                    future.set_exception(RuntimeError(reply["error"]))
+                else:
+                    future.set_result(reply.get("result"))
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+            error = ConnectionError(f"Coordinator connection to {self.path} lost")
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            self._pending.clear()
+
+    async def _send(self, op: str, **fields: Any) -> asyncio.Future[Any]:
+        writer = await self._connect()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        writer.write(json_line({"id": request_id, "op": op, **fields}).encode())
+        return future
+
+    async def _call(self, op: str, **fields: Any) -> Any:
+        future = await self._send(op, **fields)
+        return await future
+
+    async def acquire(self, key: str, limit: int) -> None:
+        future = await self._send("acquire", key=key, limit=limit)
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # The server may still grant the slot; hand it straight back.
+            def give_back(f: asyncio.Future[Any]) -> None:
+                if not f.cancelled() and f.exception() is None:
+                    self._release_nowait(key)
+
+            future.add_done_callback(give_back)
+            raise
+
+    def _release_nowait(self, key: str) -> None:
+        if self._writer is not None and not self._writer.is_closing():
+            self._writer.write(json_line({"id": None, "op": "release", "key": key}).encode())
+
+    async def release(self, key: str) -> None:
+        # Fire-and-forget with no await, so releasing is safe during cancellation.
+        self._release_nowait(key)
+
+    async def reserve(self, key: str, rate: float, burst: int = 1) -> float:
+        return await self._call("reserve", key=key, rate=rate, burst=burst)
+
+    async def throttle(self, key: str, rate: float, burst: int = 1) -> None:
+        delay = await self.reserve(key, rate, burst)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def cache_get(self, key: str) -> Any | None:
+        return await self._call("cache_get", key=key)
+
+    async def cache_set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        await self._call("cache_set", key=key, value=value, ttl=ttl)
+
+    async def close(self) -> None:
+        """Close the connection to the coordinator."""
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+        self._writer = None
+        self._reader_task = None
+
+
+_coordinator: LocalCoordinator | SocketCoordinator | None = None
+
+
+def get_coordinator() -> LocalCoordinator | SocketCoordinator:
+    """Return the process-wide coordinator.
+
+    A ``SocketCoordinator`` when ``MCP_COORDINATOR_SOCKET`` is set, otherwise
+    a ``LocalCoordinator`` (per-process behaviour).
+    """
+    global _coordinator
+    if _coordinator is None:
+        path = os.getenv("MCP_COORDINATOR_SOCKET")
+        _coordinator = SocketCoordinator(path) if path else LocalCoordinator()
+    return _coordinator
+
+
+def main() -> None:
+    """Run a coordinator on the socket given as argv[1] or ``MCP_COORDINATOR_SOCKET``."""
+    setup_logger("MCPCoordinator")
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("MCP_COORDINATOR_SOCKET")
+    if not socket_path:
+        sys.exit("usage: mcp-coordinator SOCKET_PATH")
+    asyncio.run(CoordinatorServer(socket_path).serve_forever())
@@ -11,6 +11,7 @@ from typing import Any
 
 import httpx
 
+from mcp_network_common.http_cache import CachingTransport, ResponseCache
 from mcp_network_common.response import error_response
 
 logger = logging.getLogger(__name__)
@@ -38,6 +39,7 @@ def create_http_client(
     timeout: float = 30.0,
     auth: httpx.Auth | None = None,
     headers: dict[str, str] | None = None,
+    cache: ResponseCache | None = None,
 ) -> httpx.AsyncClient:
     """Create an ``httpx.AsyncClient`` with shared TLS and timeout config.
 
@@ -46,13 +48,21 @@ def create_http_client(
         timeout: Request timeout in seconds.
         auth: Optional httpx auth (e.g. ``httpx.BasicAuth``).
         headers: Extra default headers.
+        cache: Optional ``ResponseCache``; when given, ``GET``/``HEAD``
+            responses are cached and revalidated (see ``CachingTransport``).
+            Share one cache between clients to share entries.
     """
+    verify = _tls_verify()
+    transport = None
+    if cache is not None:
+        transport = CachingTransport(httpx.AsyncHTTPTransport(verify=verify), cache)
     return httpx.AsyncClient(
         base_url=base_url,
-        verify=_tls_verify(),
+        verify=verify,
         timeout=httpx.Timeout(timeout),
         auth=auth,
         headers=headers or {},
+        transport=transport,
     )
 
 
@@ -0,0 +1,371 @@
+"""Opt-in HTTP response cache for REST device APIs (httpx transport)."""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+CACHEABLE_METHODS = ("GET", "HEAD")
+CACHEABLE_STATUS = (200, 203)
+# Headers that describe the wire encoding of the original body, not the
+# decoded body we keep, so they must not be replayed from the cache.
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+# Request headers that carry credentials or sessions on common controllers
+# (bearer/basic auth, session cookies, vendor token headers).
+CREDENTIAL_HEADERS: tuple[str, ...] = (
+    "authorization",
+    "proxy-authorization",
+    "cookie",
+    "x-auth-token",
+    "x-api-key",
+    "x-xsrf-token",
+)
+
+
+def _cache_control(value: str | None) -> dict[str, str | None]:
+    """Parse a ``Cache-Control`` header into ``{directive: value-or-None}``."""
+    directives: dict[str, str | None] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def _http_date(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _seconds(value: str | None) -> float:
+    """Parse a delta-seconds value (``max-age``, ``Age``); invalid means 0."""
+    try:
+        return max(0.0, float(value))  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _freshness_lifetime(headers: httpx.Headers) -> float | None:
+    """Return how long a response stays fresh in seconds, or ``None`` if unknown.
+
+    The response's ``Age`` (time already spent in upstream caches) is
+    subtracted, so a response that arrives stale is never served as fresh.
+    """
+    cc = _cache_control(headers.get("cache-control"))
+    lifetime: float | None = None
+    for directive in ("s-maxage", "max-age"):
+        if directive in cc:
+            lifetime = _seconds(cc[directive])
+            break
+    else:
+        expires = headers.get("expires")
+        if expires is not None:
+            expires_at = _http_date(expires)
+            if expires_at is None:
+                return 0.0
+            date = _http_date(headers.get("date")) or time.time()
+            lifetime = max(0.0, expires_at - date)
+    if lifetime is None:
+        return None
+    return max(0.0, lifetime - _seconds(headers.get("age")))
+
+
+class ResponseCache:
+    """Bounded LRU store for cached responses, optionally backed by disk.
+
+    Entries are plain dicts (status, headers, body, store time, vary values)
+    so they can be written to *directory* as JSON and survive restarts.
+
+    Args:
+        max_entries: Maximum number of entries kept in memory.
+        max_bytes: Maximum total body size kept in memory.
+        directory: Optional directory for a persistent second tier, created
+            with mode 0700; entry files are written with mode 0600.
+        max_disk_entries: Maximum number of entries kept in *directory*.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 256,
+        max_bytes: int = 32 * 1024 * 1024,
+        directory: str | None = None,
+        max_disk_entries: int = 4096,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_entries = max_disk_entries
+        self._entries: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._bytes = 0
+        self._disk_count = 0
+        self._stats = {"hits": 0, "misses": 0, "revalidated": 0, "stored": 0}
+        if directory:
+            # Bodies are authenticated API responses: keep them owner-only.
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            self._disk_count = sum(1 for n in os.listdir(directory) if n.endswith(".json"))
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters plus the current number of memory entries.
+
+        ``hits`` were served without network I/O, ``revalidated`` were
+        confirmed by a ``304``, ``misses`` needed a full response.
+        """
+        return {**self._stats, "entries": len(self._entries)}
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the entry for *key* from memory or disk, or ``None``."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, entry: dict[str, Any]) -> None:
+        """Store *entry* under *key* in memory and, if configured, on disk."""
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+        self._stats["stored"] += 1
+
+    def delete(self, key: str) -> None:
+        """Drop *key* from both tiers."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= len(entry["body"])
+        path = self._path(key)
+        if path and os.path.exists(path):
+            os.remove(path)
+            self._disk_count -= 1
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        for key in list(self._entries):
+            self.delete(key)
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    os.remove(os.path.join(self.directory, name))
+            self._disk_count = 0
+
+    def _remember(self, key: str, entry: dict[str, Any]) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old["body"])
+        if len(entry["body"]) > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self._bytes += len(entry["body"])
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted["body"])
+
+    def _path(self, key: str) -> str | None:
+        return os.path.join(self.directory, f"{key}.json") if self.directory else None
+
+    def _read_disk(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            entry["body"] = base64.b64decode(entry["body"])
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Ignoring unreadable cache entry %s: %s", path, e)
+            return None
+        return entry
+
+    def _write_disk(self, key: str, entry: dict[str, Any]) -> None:
+        path = self._path(key)
+        if not path:
+            return
+        existed = os.path.exists(path)
+        tmp = f"{path}.tmp"
+        try:
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w") as f:
+                json.dump({**entry, "body": base64.b64encode(entry["body"]).decode()}, f)
+            os.replace(tmp, path)
+            if not existed:
+                self._disk_count += 1
+            if self._disk_count > self.max_disk_entries:
+                self._trim_disk()
+        except OSError as e:
+            logger.warning("Could not write cache entry %s: %s", path, e)
+
+    def _trim_disk(self) -> None:
+        assert self.directory
+        paths = [
+            os.path.join(self.directory, n)
+            for n in os.listdir(self.directory)
+            if n.endswith(".json")
+        ]
+        paths.sort(key=os.path.getmtime)
+        excess = len(paths) - self.max_disk_entries
+        for path in paths[: max(0, excess)]:
+            os.remove(path)
+        self._disk_count = min(len(paths), self.max_disk_entries)
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """httpx transport that serves ``GET``/``HEAD`` responses from a ``ResponseCache``.
+
+    Fresh entries (per ``Cache-Control: max-age`` or ``Expires``, less any
+    ``Age``) are returned without network I/O, unless the request's own
+    ``Cache-Control: max-age`` is exceeded (``max-age=0`` always revalidates). Stale entries with an ``ETag`` or ``Last-Modified``
+    are revalidated with ``If-None-Match``/``If-Modified-Since``, and a ``304``
+    refreshes the stored entry. ``no-store`` responses are never stored,
+    ``no-cache`` ones are always revalidated, and a successful unsafe request
+    (``POST``, ``PUT``, ...) evicts the cached entry for its URL.
+
+    Responses served from the cache (fresh or revalidated) carry
+    ``response.extensions["from_cache"] = True``.
+
+    Entries are keyed by method, URL and the values of *credential_headers*,
+    so clients with different credentials or sessions never share entries.
+    Add any vendor-specific token header the controller uses.
+
+    Args:
+        transport: The transport that performs real requests.
+        cache: Where responses are stored; a fresh ``ResponseCache`` if omitted.
+        credential_headers: Request headers that identify the caller.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        cache: ResponseCache | None = None,
+        *,
+        credential_headers: Sequence[str] = CREDENTIAL_HEADERS,
+    ) -> None:
+        self.transport = transport
+        self.cache = cache or ResponseCache()
+        self.credential_headers = tuple(h.lower() for h in credential_headers)
+
+    def _key(self, method: str, request: httpx.Request) -> str:
+        parts = [method, str(request.url)]
+        for name in self.credential_headers:
+            parts.append(f"{name}:{request.headers.get(name, '')}")
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self.cache._stats
+        if request.method not in CACHEABLE_METHODS:
+            response = await self.transport.handle_async_request(request)
+            if response.status_code < 400:
+                for method in CACHEABLE_METHODS:
+                    self.cache.delete(self._key(method, request))
+            return response
+
+        request_cc = _cache_control(request.headers.get("cache-control"))
+        conditional = "if-none-match" in request.headers or "if-modified-since" in request.headers
+        if "no-store" in request_cc or conditional:
+            return await self.transport.handle_async_request(request)
+
+        key = self._key(request.method, request)
+        entry = self.cache.get(key)
+        if entry is not None and any(
+            request.headers.get(name) != value for name, value in entry["vary"].items()
+        ):
+            entry = None
+
+        if entry is not None:
+            headers = httpx.Headers(entry["headers"])
+            lifetime = _freshness_lifetime(headers)
+            must_revalidate = "no-cache" in request_cc or "no-cache" in _cache_control(
+                headers.get("cache-control")
+            )
+            age = time.time() - entry["stored_at"]
+            # A request max-age (e.g. "max-age=0") caps the acceptable age.
+            if "max-age" in request_cc:
+                must_revalidate = must_revalidate or (
+                    age + _seconds(headers.get("age")) >= _seconds(request_cc["max-age"])
+                )
+            if not must_revalidate and lifetime is not None and age < lifetime:
+                stats["hits"] += 1
+                return self._build(entry, request, from_cache=True)
+            if headers.get("etag"):
+                request.headers["If-None-Match"] = headers["etag"]
+            if headers.get("last-modified"):
+                request.headers["If-Modified-Since"] = headers["last-modified"]
+
+        response = await self.transport.handle_async_request(request)
+
+        if entry is not None and response.status_code == 304:
+            await response.aclose()
+            headers = httpx.Headers(entry["headers"])
+            headers.update(
+                {k: v for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS}
+            )
+            entry = {**entry, "headers": list(headers.multi_items()), "stored_at": time.time()}
+            self.cache.put(key, entry)
+            stats["revalidated"] += 1
+            return self._build(entry, request, from_cache=True)
+
+        stats["misses"] += 1
+        if not self._storable(response):
+            return response
+
+        body = await response.aread()
+        await response.aclose()
+        entry = {
+            "status": response.status_code,
+            "headers": [
+                (k, v) for k, v in response.headers.multi_items() if k.lower() not in _DROP_HEADERS
+            ],
+            "body": body,
+            "stored_at": time.time(),
+            "vary": {
+                name.strip().lower(): request.headers.get(name.strip())
+                for name in response.headers.get("vary", "").split(",")
+                if name.strip()
+            },
+        }
+        self.cache.put(key, entry)
+        return self._build(entry, request, from_cache=False)
+
+    @staticmethod
+    def _storable(response: httpx.Response) -> bool:
+        if response.status_code not in CACHEABLE_STATUS:
+            return False
+        headers = response.headers
+        if "no-store" in _cache_control(headers.get("cache-control")):
+            return False
+        if headers.get("vary", "").strip() == "*":
+            return False
+        has_validator = "etag" in headers or "last-modified" in headers
+        return has_validator or bool(_freshness_lifetime(headers))
+
+    @staticmethod
+    def _build(
+        entry: dict[str, Any], request: httpx.Request, *, from_cache: bool
+    ) -> httpx.Response:
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=entry["body"],
+            request=request,
+            extensions={"from_cache": from_cache},
+        )
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -2,7 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
+import inspect
+import itertools
 import json
+import time
+from collections.abc import AsyncIterator, Awaitable, Mapping
 from typing import Any
 
 
@@ -31,3 +37,159 @@ def error_response(error: str | Exception) -> str:
         error_response(some_exception)
     """
     return json_dumps({"status": "error", "error": str(error)})
+
+
+def json_line(data: Any) -> str:
+    """Serialize *data* to one compact JSON line (NDJSON), newline-terminated."""
+    return json.dumps(data, separators=(",", ":"), default=str) + "\n"
+
+
+class NdjsonResponse:
+    """Incremental NDJSON builder for per-device results.
+
+    Each ``ok``/``error`` call returns one compact JSON line to emit right
+    away; only counters, the *slowest* N timings and the first *max_errors*
+    errors are kept, so memory stays bounded whatever the fleet size.
+    ``summary`` returns the closing record.
+
+    Example::
+
+        stream = NdjsonResponse()
+        yield stream.ok("sw01", elapsed=0.8, output="...")
+        # '{"status":"ok","device":"sw01","elapsed":0.8,"output":"..."}\n'
+        yield stream.error("sw02", "timeout", elapsed=30.0)
+        yield stream.summary()
+        # '{"status":"summary","total":2,"ok":1,"error":1,...}\n'
+
+    Args:
+        slowest: How many of the slowest devices to report in the summary.
+        max_errors: How many error details to keep for the summary.
+    """
+
+    def __init__(self, *, slowest: int = 5, max_errors: int = 50) -> None:
+        self.slowest = slowest
+        self.max_errors = max_errors
+        self.ok_count = 0
+        self.error_count = 0
+        self._slowest: list[tuple[float, str]] = []
+        self._errors: list[dict[str, str]] = []
+        self._started = time.monotonic()
+
+    def _timed(self, device: str, elapsed: float) -> float:
+        elapsed = round(elapsed, 3)
+        if self.slowest > 0:
+            if len(self._slowest) < self.slowest:
+                heapq.heappush(self._slowest, (elapsed, device))
+            else:
+                heapq.heappushpop(self._slowest, (elapsed, device))
+        return elapsed
+
+    def ok(self, device: str, *, elapsed: float = 0.0, **fields: Any) -> str:
+        """Return the success record for *device*."""
+        self.ok_count += 1
+        elapsed = self._timed(device, elapsed)
+        return json_line({"status": "ok", "device": device, "elapsed": elapsed, **fields})
+
+    def error(self, device: str, error: str | Exception, *, elapsed: float = 0.0) -> str:
+        """Return the error record for *device*."""
+        self.error_count += 1
+        elapsed = self._timed(device, elapsed)
+        if len(self._errors) < self.max_errors:
+            self._errors.append({"device": device, "error": str(error)})
+        return json_line(
+            {"status": "error", "device": device, "elapsed": elapsed, "error": str(error)}
+        )
+
+    def summary(self) -> str:
+        """Return the final record: counts, slowest devices and errors."""
+        return json_line(
+            {
+                "status": "summary",
+                "total": self.ok_count + self.error_count,
+                "ok": self.ok_count,
+                "error": self.error_count,
+                "elapsed": round(time.monotonic() - self._started, 3),
+                "slowest": [
+                    {"device": device, "elapsed": elapsed}
+                    for elapsed, device in sorted(self._slowest, reverse=True)
+                ],
+                "errors": self._errors,
+                "errors_truncated": self.error_count > len(self._errors),
+            }
+        )
+
+
+def _discard(aw: Awaitable[Any]) -> None:
+    """Close or cancel an awaitable that will never be awaited."""
+    if inspect.iscoroutine(aw) and inspect.getcoroutinestate(aw) == inspect.CORO_CREATED:
+        aw.close()
+    elif isinstance(aw, asyncio.Future):
+        aw.cancel()
+
+
+async def stream_responses(
+    results: Mapping[str, Awaitable[Any]],
+    *,
+    concurrency: int | None = None,
+    slowest: int = 5,
+    max_errors: int = 50,
+) -> AsyncIterator[str]:
+    """Run per-device awaitables and yield one NDJSON line each as they finish.
+
+    Each result is stored under the record's ``result`` key; an exception
+    becomes an error record. A summary line (see ``NdjsonResponse.summary``)
+    comes last. With *concurrency* set, awaitables are started only as
+    earlier ones finish. A line is released as soon as it is yielded, so
+    memory holds only in-flight results, not the whole fleet's output. If
+    the consumer stops early, the remaining work is cancelled.
+
+    Example::
+
+        async for line in stream_responses({d: run_show(d) for d in devices}):
+            await send(line)
+
+    Args:
+        results: Mapping of device name to awaitable producing its result.
+        concurrency: Maximum number of awaitables running at once.
+        slowest: How many of the slowest devices to report in the summary.
+        max_errors: How many error details to keep for the summary.
+    """
+    stream = NdjsonResponse(slowest=slowest, max_errors=max_errors)
+
+    async def timed(device: str, aw: Awaitable[Any]) -> str:
+        start = time.monotonic()
+        try:
+            result = await aw
+        except Exception as e:
+            return stream.error(device, e, elapsed=time.monotonic() - start)
+        return stream.ok(device, elapsed=time.monotonic() - start, result=result)
+
+    # Tasks are started lazily (at most *concurrency* at once) and dropped as
+    # soon as their line is yielded, so finished output is never retained.
+    waiting = iter(results.items())
+    pending: dict[asyncio.Task[str], Awaitable[Any]] = {}
+
+    def start(count: int) -> None:
+        for device, aw in itertools.islice(waiting, count):
+            pending[asyncio.ensure_future(timed(device, aw))] = aw
+
+    start(concurrency or len(results))
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            while done:
+                task = done.pop()
+                del pending[task]
+                line = task.result()
+                del task
+                if concurrency:
+                    start(1)
+                yield line
+                del line
+    finally:
+        for task, aw in pending.items():
+            task.cancel()
+            _discard(aw)
+        for _, aw in waiting:
+            _discard(aw)
+    yield stream.summary()
@@ -0,0 +1,181 @@
+"""Context-managed device sessions over SSH or HTTP."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from typing import Any
+
+import httpx
+from scrapli import AsyncScrapli
+
+from mcp_network_common.coordination import LocalCoordinator, SocketCoordinator, get_coordinator
+from mcp_network_common.http import create_http_client
+from mcp_network_common.inventory import get_device
+from mcp_network_common.ssh import create_scrapli_conn
+
+logger = logging.getLogger(__name__)
+
+HTTP_TRANSPORTS = ("http", "https")
+
+
+class SessionTracker:
+    """Track open sessions per device and enforce a per-device vty budget.
+
+    Each device gets a FIFO semaphore sized from its inventory
+    ``max_sessions`` entry (or *default_max_sessions*). Callers over budget
+    wait for a slot instead of failing, so a burst of tool calls never opens
+    more sessions than the device has vty lines. The semaphores live in the
+    coordinator, so with ``MCP_COORDINATOR_SOCKET`` set the budget is shared
+    by every worker process; the open/waiting counts are this process's own.
+
+    Args:
+        default_max_sessions: Budget for devices without ``max_sessions``.
+        coordinator: Where the semaphores live; defaults to ``get_coordinator()``.
+    """
+
+    def __init__(
+        self,
+        default_max_sessions: int = 4,
+        coordinator: LocalCoordinator | SocketCoordinator | None = None,
+    ) -> None:
+        self.default_max_sessions = default_max_sessions
+        self.coordinator = coordinator
+        self._seen: set[str] = set()
+        self._open: dict[str, int] = {}
+        self._waiting: dict[str, int] = {}
+
+    def open_sessions(self, device_name: str) -> int:
+        """Return the number of sessions currently open to *device_name*."""
+        return self._open.get(device_name, 0)
+
+    def waiting(self, device_name: str) -> int:
+        """Return the number of callers queued for a slot on *device_name*."""
+        return self._waiting.get(device_name, 0)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return ``{device: {"open": n, "waiting": m}}`` for every seen device."""
+        return {
+            name: {"open": self.open_sessions(name), "waiting": self.waiting(name)}
+            for name in self._seen
+        }
+
+    @asynccontextmanager
+    async def slot(self, device_name: str, max_sessions: int | None = None) -> AsyncIterator[None]:
+        """Hold one session slot on *device_name* for the duration of the block.
+
+        The budget is fixed the first time a device is seen.
+        """
+        coordinator = self.coordinator or get_coordinator()
+        key = f"sessions:{device_name}"
+        self._seen.add(device_name)
+        self._waiting[device_name] = self.waiting(device_name) + 1
+        try:
+            await coordinator.acquire(key, max_sessions or self.default_max_sessions)
+        finally:
+            self._waiting[device_name] -= 1
+        self._open[device_name] = self.open_sessions(device_name) + 1
+        try:
+            yield
+        finally:
+            self._open[device_name] -= 1
+            await coordinator.release(key)
+
+
+_tracker = SessionTracker()
+
+
+def get_session_tracker() -> SessionTracker:
+    """Return the process-wide tracker used by ``open_device`` by default."""
+    return _tracker
+
+
+async def _close(device_name: str, close: Callable[[], Awaitable[Any]]) -> None:
+    """Run *close* to completion even if the caller is cancelled meanwhile.
+
+    Re-raises ``CancelledError`` afterwards so cancellation still propagates.
+    """
+    task = asyncio.ensure_future(close())
+    cancelled = False
+    while not task.done():
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                cancelled = True
+        except Exception:
+            pass
+    if task.cancelled():
+        logger.warning("Close of session to %s was cancelled", device_name)
+    elif task.exception() is not None:
+        logger.warning("Error closing session to %s", device_name, exc_info=task.exception())
+    if cancelled:
+        raise asyncio.CancelledError
+
+
+@asynccontextmanager
+async def open_device(
+    device_name: str,
+    devices: dict[str, dict[str, Any]],
+    *,
+    platform: str | None = None,
+    tracker: SessionTracker | None = None,
+    **conn_kwargs: Any,
+) -> AsyncIterator[AsyncScrapli | httpx.AsyncClient]:
+    """Open a session to *device_name* and always close it on exit.
+
+    The transport comes from the inventory entry's ``transport`` key:
+    ``"ssh"`` (default) yields an open ``AsyncScrapli`` connection,
+    ``"http"``/``"https"`` yields an ``httpx.AsyncClient``. Its base URL is
+    the entry's ``base_url`` if set, else ``{transport}://{host}`` with
+    ``:{http_port}`` appended when the entry sets ``http_port`` (the
+    scheme's default port otherwise). ``port`` is always the SSH port, as
+    ``load_inventory`` fills it in with 22. The session is closed on normal exit, on error, and on
+    task cancellation. Sessions count against the device's ``max_sessions``
+    budget; callers over budget queue.
+
+    Usage::
+
+        async with open_device(device_name, devices) as conn:
+            resp = await conn.send_command("show version")
+
+    Args:
+        device_name: Key to look up in the devices dict.
+        devices: The inventory dict (from ``load_inventory``).
+        platform: Scrapli platform string; defaults to the entry's ``platform``.
+        tracker: Session tracker; defaults to ``get_session_tracker()``.
+        **conn_kwargs: Passed to ``create_scrapli_conn`` or ``create_http_client``.
+    """
+    device = get_device(device_name, devices)
+    transport = str(device.get("transport", "ssh")).lower()
+    if transport != "ssh" and transport not in HTTP_TRANSPORTS:
+        raise ValueError(f"Unsupported transport '{transport}' for device '{device_name}'")
+    platform = platform or device.get("platform")
+    if transport == "ssh" and not platform:
+        raise ValueError(f"No platform configured for device '{device_name}'")
+
+    tracker = tracker or _tracker
+    async with tracker.slot(device_name, device.get("max_sessions")):
+        if transport == "ssh":
+            conn: AsyncScrapli | httpx.AsyncClient = await create_scrapli_conn(
+                device, platform=platform, **conn_kwargs
+            )
+            close = conn.close
+        else:
+            username = device.get("username")
+            base_url = device.get("base_url") or f"{transport}://{device['host']}"
+            if "base_url" not in device and device.get("http_port"):
+                base_url += f":{device['http_port']}"
+            conn = create_http_client(
+                base_url=base_url,
+                auth=httpx.BasicAuth(username, device.get("password", "")) if username else None,
+                headers=device.get("headers"),
+                **conn_kwargs,
+            )
+            close = conn.aclose
+        try:
+            yield conn
+        finally:
+            await _close(device_name, close)
@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import functools
+import hashlib
 import logging
+import os
+from collections import OrderedDict
 from collections.abc import Callable
 from typing import Any
 
+import asyncssh
 from scrapli import AsyncScrapli
 from scrapli.exceptions import (
     ScrapliAuthenticationFailed,
@@ -18,6 +22,147 @@ from mcp_network_common.response import error_response
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_KNOWN_HOSTS = os.path.join("~", ".ssh", "mcp_known_hosts")
+# Inventory keys passed straight to asyncssh to pin the negotiated algorithms.
+SSH_ALGORITHM_KEYS = ("kex_algs", "encryption_algs", "mac_algs", "server_host_key_algs")
+MAX_CACHED_OPTIONS = 1024
+
+
+class KnownHostsStore:
+    """Trust-on-first-use host key store in OpenSSH ``known_hosts`` format.
+
+    The first key seen for a host is written to the file; later connections
+    must present the same key. The file is parsed once and each host's entry
+    is imported into asyncssh once, then reused for every connection.
+
+    Args:
+        path: File to use; defaults to ``MCP_SSH_KNOWN_HOSTS`` or
+            ``~/.ssh/mcp_known_hosts``.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        self.path = os.path.expanduser(
+            path or os.getenv("MCP_SSH_KNOWN_HOSTS") or DEFAULT_KNOWN_HOSTS
+        )
+        self._lines: dict[str, list[str]] | None = None
+        self._imported: dict[str, asyncssh.SSHKnownHosts] = {}
+
+    @staticmethod
+    def host_spec(host: str, port: int) -> str:
+        """Return the ``known_hosts`` host field for *host* and *port*."""
+        return host if port == 22 else f"[{host}]:{port}"
+
+    def _load(self) -> dict[str, list[str]]:
+        if self._lines is None:
+            self._lines = {}
+            if os.path.exists(self.path):
+                with open(self.path) as f:
+                    for line in f:
+                        spec, _, key = line.strip().partition(" ")
+                        if spec and key and not spec.startswith("#"):
+                            self._lines.setdefault(spec, []).append(line.strip())
+        return self._lines
+
+    def lookup(self, host: str, port: int = 22) -> asyncssh.SSHKnownHosts | None:
+        """Return the trusted keys for *host*, or ``None`` if it was never seen."""
+        spec = self.host_spec(host, port)
+        if spec not in self._imported:
+            lines = self._load().get(spec)
+            if not lines:
+                return None
+            self._imported[spec] = asyncssh.import_known_hosts("\n".join(lines) + "\n")
+        return self._imported[spec]
+
+    def learn(self, host: str, port: int, key: asyncssh.SSHKey) -> None:
+        """Record *key* as the trusted host key for *host*."""
+        spec = self.host_spec(host, port)
+        line = f"{spec} {' '.join(key.export_public_key().decode().split()[:2])}"
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(line + "\n")
+        self._load().setdefault(spec, []).append(line)
+        self._imported.pop(spec, None)
+        logger.info("Learned SSH host key for %s", spec)
+
+
+_known_hosts: KnownHostsStore | None = None
+_client_keys: dict[tuple[str, str], list[asyncssh.SSHKeyPair]] = {}
+# Per device: (trusted host keys the options were built with, options).
+_connection_options: OrderedDict[
+    tuple[Any, ...], tuple[asyncssh.SSHKnownHosts | None, asyncssh.SSHClientConnectionOptions]
+] = OrderedDict()
+
+
+def get_known_hosts_store() -> KnownHostsStore:
+    """Return the process-wide store used by ``create_scrapli_conn(fast_path=True)``."""
+    global _known_hosts
+    if _known_hosts is None:
+        _known_hosts = KnownHostsStore()
+    return _known_hosts
+
+
+def _secret_digest(secret: str | None) -> str:
+    """Return a digest of *secret* for use in cache keys (never the secret itself)."""
+    return hashlib.sha256((secret or "").encode()).hexdigest()
+
+
+def _load_client_keys(key_path: str, passphrase: str | None) -> list[asyncssh.SSHKeyPair]:
+    """Load (and decrypt) a private key once per process."""
+    path = os.path.expanduser(key_path)
+    cache_key = (path, _secret_digest(passphrase))
+    if cache_key not in _client_keys:
+        _client_keys[cache_key] = asyncssh.load_keypairs(path, passphrase)
+    return _client_keys[cache_key]
+
+
+def _options_key(device: dict[str, Any], port: int) -> tuple[Any, ...]:
+    return (
+        device["host"],
+        port,
+        device.get("username"),
+        tuple((k, tuple(device[k])) for k in SSH_ALGORITHM_KEYS if device.get(k)),
+        device.get("private_key"),
+        _secret_digest(device.get("private_key_passphrase")),
+    )
+
+
+def _fast_path_options(
+    device: dict[str, Any],
+    port: int,
+    trusted: asyncssh.SSHKnownHosts | None,
+) -> dict[str, Any]:
+    """Return asyncssh ``transport_options`` for *device*.
+
+    The costly parts, decrypting the client key and importing the trusted
+    host keys, are cached per process. The ``SSHClientConnectionOptions``
+    built from them is kept per device too (bounded by
+    ``MAX_CACHED_OPTIONS`` and rebuilt when the trusted keys change), but
+    asyncssh copies and re-prepares it on every connect, so that part saves
+    little on its own.
+    """
+    key = _options_key(device, port)
+    cached = _connection_options.get(key)
+    if cached is not None and cached[0] is trusted:
+        _connection_options.move_to_end(key)
+        options = cached[1]
+    else:
+        kwargs: dict[str, Any] = {k: list(device[k]) for k in SSH_ALGORITHM_KEYS if device.get(k)}
+        if device.get("private_key"):
+            kwargs["client_keys"] = _load_client_keys(
+                device["private_key"], device.get("private_key_passphrase")
+            )
+        options = asyncssh.SSHClientConnectionOptions(config=None, known_hosts=trusted, **kwargs)
+        _connection_options[key] = (trusted, options)
+        _connection_options.move_to_end(key)
+        while len(_connection_options) > MAX_CACHED_OPTIONS:
+            _connection_options.popitem(last=False)
+    # scrapli passes its own known_hosts/client_keys to connect(), which would
+    # override the values inside *options*, so repeat them explicitly.
+    transport_options: dict[str, Any] = {"options": options, "known_hosts": trusted}
+    if device.get("private_key"):
+        transport_options["client_keys"] = options.client_keys
+    return transport_options
+
 
 async def create_scrapli_conn(
     device: dict[str, Any],
@@ -27,9 +172,18 @@ async def create_scrapli_conn(
     timeout_socket: int = 30,
     timeout_transport: int = 30,
     timeout_ops: int = 60,
+    fast_path: bool = False,
+    known_hosts: KnownHostsStore | None = None,
 ) -> AsyncScrapli:
     """Create and open an AsyncScrapli connection.
 
+    With *fast_path*, algorithm preferences (``kex_algs``, ``encryption_algs``,
+    ``mac_algs``, ``server_host_key_algs``) and key-based auth
+    (``private_key``, ``private_key_passphrase``) are read from *device*,
+    decrypted client keys and imported host keys are cached per process,
+    and the host key is checked against a trust-on-first-use
+    ``KnownHostsStore`` instead of being ignored.
+
     Args:
         device: Device dict with host, username, password, and port keys.
         platform: Scrapli platform string (e.g. "cisco_iosxe", "fortinet_fortios").
@@ -37,20 +191,49 @@ async def create_scrapli_conn(
         timeout_socket: Socket timeout in seconds.
         timeout_transport: Transport timeout in seconds.
         timeout_ops: Operations timeout in seconds.
+        fast_path: Enable the inventory-driven options and host key store.
+        known_hosts: Host key store; defaults to ``get_known_hosts_store()``.
     """
+    port = device.get(port_key, 22)
+    transport_options: dict[str, Any] = {}
+    trusted = None
+    if fast_path:
+        known_hosts = known_hosts or get_known_hosts_store()
+        trusted = known_hosts.lookup(device["host"], port)
+        # known_hosts=None makes asyncssh accept the key; it is learned below.
+        transport_options["asyncssh"] = _fast_path_options(device, port, trusted)
     conn = AsyncScrapli(
         host=device["host"],
         auth_username=device.get("username", "admin"),
         auth_password=device.get("password", ""),
         platform=platform,
-        port=device.get(port_key, 22),
+        port=port,
         auth_strict_key=False,
         transport="asyncssh",
+        transport_options=transport_options,
         timeout_socket=timeout_socket,
         timeout_transport=timeout_transport,
         timeout_ops=timeout_ops,
     )
-    await conn.open()
+    try:
+        await conn.open()
+    except BaseException as e:
+        # Don't leak a half-open transport (or a vty line) on failure or cancel.
+        try:
+            await conn.close()
+        except Exception:
+            pass
+        if isinstance(e, asyncssh.HostKeyNotVerifiable):
+            raise ScrapliAuthenticationFailed(
+                f"Host key verification failed for {device['host']}: {e}"
+            ) from e
+        raise
+    if fast_path and trusted is None:
+        server_key = conn.transport.session.get_server_host_key()
+        if server_key is not None:
+            known_hosts.learn(device["host"], port, server_key)
+            # Options built while the host was unknown accept any key.
+            _connection_options.pop(_options_key(device, port), None)
     return conn
 
 
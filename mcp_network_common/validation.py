@@ -5,6 +5,8 @@ from __future__ import annotations
 import re
 from collections.abc import Sequence
 
+from mcp_network_common.config_diff import config_delta, negate_line
+
 
 class CommandValidator:
     """Base validator for network device commands.
@@ -17,6 +19,9 @@ class CommandValidator:
         config_blocked_patterns: List of (regex, label) tuples for config commands.
         block_pipe_redirect: Whether to block ``|``, ``>``, ``<`` in read-only
             commands.
+        config_negate_prefix: Keyword that removes a config line (``"no"`` on
+            IOS-style CLIs), used by ``negate_config_line``.
+        config_comment_prefixes: Config line prefixes ignored when diffing.
     """
 
     readonly_prefixes: tuple[str, ...] = ("show",)
@@ -37,6 +42,8 @@ class CommandValidator:
         (r"\bformat\b", "format"),
     ]
     block_pipe_redirect: bool = True
+    config_negate_prefix: str = "no"
+    config_comment_prefixes: tuple[str, ...] = ("!",)
 
     def validate_readonly(self, command: str) -> str | None:
         """Validate a read-only command. Return error message or ``None``."""
@@ -59,3 +66,32 @@ class CommandValidator:
             if re.search(pattern, joined, flags=re.MULTILINE):
                 return f"Dangerous command blocked: '{label}'"
         return None
+
+    def negate_config_line(self, line: str) -> str:
+        """Return the command that removes *line*.
+
+        Prefix-negates with ``config_negate_prefix`` by default. Override for
+        CLIs that rewrite instead (e.g. Junos ``set x`` -> ``delete x``); such
+        validators also need ``config_blocked_patterns`` that allow the
+        removal keyword.
+        """
+        return negate_line(line, self.config_negate_prefix)
+
+    def validate_config_delta(
+        self,
+        running: str | Sequence[str],
+        intended: str | Sequence[str],
+    ) -> tuple[list[str], str | None]:
+        """Diff *running* against *intended* and validate only the changed lines.
+
+        Returns ``(commands, error)``: the minimal command list from
+        ``config_delta`` and the ``validate_config`` result for it. Push
+        *commands* only when *error* is ``None``.
+        """
+        commands = config_delta(
+            running,
+            intended,
+            negate=self.negate_config_line,
+            comment_prefixes=self.config_comment_prefixes,
+        )
+        return commands, self.validate_config(commands)
@@ -0,0 +1,237 @@
+"""Tests for config_diff module."""
+
+from __future__ import annotations
+
+import time
+
+from mcp_network_common.config_diff import config_delta, parse_config
+
+RUNNING = """\
+hostname sw01
+!
+interface GigabitEthernet0/1
+ description uplink
+ ip address 10.0.0.1 255.255.255.0
+ no shutdown
+!
+interface GigabitEthernet0/2
+ description unused
+!
+router ospf 1
+ network 10.0.0.0 0.0.0.255 area 0
+!
+ntp server 10.1.1.1
+"""
+
+
+class TestParseConfig:
+    def test_builds_hierarchy(self):
+        root = parse_config(RUNNING)
+        assert list(root.children) == [
+            "hostname sw01",
+            "interface GigabitEthernet0/1",
+            "interface GigabitEthernet0/2",
+            "router ospf 1",
+            "ntp server 10.1.1.1",
+        ]
+        intf = root.children["interface GigabitEthernet0/1"]
+        assert "no shutdown" in intf.children
+
+    def test_skips_comments_and_blank_lines(self):
+        root = parse_config(["!", "", "hostname r1", "  ", "! comment"])
+        assert list(root.children) == ["hostname r1"]
+
+    def test_nested_sections(self):
+        root = parse_config(
+            [
+                "router bgp 65000",
+                " address-family ipv4",
+                "  neighbor 1.1.1.1 activate",
+                " exit-address-family",
+            ]
+        )
+        bgp = root.children["router bgp 65000"]
+        assert "neighbor 1.1.1.1 activate" in bgp.children["address-family ipv4"].children
+        assert "exit-address-family" in bgp.children
+
+    def test_lines_roundtrip(self):
+        lines = ["interface Gi0/1", " description x", " ip address 1.1.1.1 255.0.0.0"]
+        assert parse_config(lines).lines() == lines
+
+
+class TestConfigDelta:
+    def test_identical_configs_produce_nothing(self):
+        assert config_delta(RUNNING, RUNNING) == []
+
+    def test_changed_child_line_only(self):
+        intended = RUNNING.replace("description uplink", "description core-uplink")
+        assert config_delta(RUNNING, intended) == [
+            "interface GigabitEthernet0/1",
+            " description core-uplink",
+        ]
+
+    def test_removed_section_negated_once(self):
+        intended = RUNNING.replace("interface GigabitEthernet0/2\n description unused\n", "")
+        assert config_delta(RUNNING, intended) == ["no interface GigabitEthernet0/2"]
+
+    def test_added_section_includes_children(self):
+        intended = RUNNING + "interface Loopback0\n ip address 1.1.1.1 255.255.255.255\n"
+        assert config_delta(RUNNING, intended) == [
+            "interface Loopback0",
+            " ip address 1.1.1.1 255.255.255.255",
+        ]
+
+    def test_removing_negated_line_drops_prefix(self):
+        intended = RUNNING.replace(" no shutdown\n", "")
+        assert config_delta(RUNNING, intended) == [
+            "interface GigabitEthernet0/1",
+            " shutdown",
+        ]
+
+    def test_address_change_replaced_in_place(self):
+        intended = RUNNING.replace("10.0.0.1 255.255.255.0", "10.0.0.2 255.255.255.0")
+        assert config_delta(RUNNING, intended) == [
+            "interface GigabitEthernet0/1",
+            " ip address 10.0.0.2 255.255.255.0",
+        ]
+
+    def test_secondary_address_change_negates_old(self):
+        running = [
+            "interface Vlan10",
+            " ip address 10.0.0.1 255.255.255.0",
+            " ip address 10.0.1.1 255.255.255.0 secondary",
+        ]
+        intended = [running[0], running[1], " ip address 10.0.2.1 255.255.255.0 secondary"]
+        assert config_delta(running, intended) == [
+            "interface Vlan10",
+            " no ip address 10.0.1.1 255.255.255.0 secondary",
+            " ip address 10.0.2.1 255.255.255.0 secondary",
+        ]
+
+    def test_primary_change_keeps_secondaries(self):
+        running = [
+            "interface Vlan10",
+            " ip address 10.0.0.1 255.255.255.0",
+            " ip address 10.0.1.1 255.255.255.0 secondary",
+        ]
+        intended = [running[0], " ip address 10.0.0.2 255.255.255.0", running[2]]
+        assert config_delta(running, intended) == [
+            "interface Vlan10",
+            " ip address 10.0.0.2 255.255.255.0",
+        ]
+
+    def test_replace_prefix_removed_without_replacement_is_negated(self):
+        intended = RUNNING.replace(" description uplink\n", "")
+        assert config_delta(RUNNING, intended) == [
+            "interface GigabitEthernet0/1",
+            " no description uplink",
+        ]
+
+    def test_replace_prefixes_disabled(self):
+        intended = RUNNING.replace("hostname sw01", "hostname sw02")
+        assert config_delta(RUNNING, intended, replace_prefixes=()) == [
+            "no hostname sw01",
+            "hostname sw02",
+        ]
+        assert config_delta(RUNNING, intended) == ["hostname sw02"]
+
+    def test_toggle_not_sent_twice(self):
+        running = ["interface Gi0/1", " shutdown"]
+        intended = ["interface Gi0/1", " no shutdown"]
+        assert config_delta(running, intended) == ["interface Gi0/1", " no shutdown"]
+        assert config_delta(intended, running) == ["interface Gi0/1", " shutdown"]
+
+    def test_referenced_section_removed_after_rebinding(self):
+        running = [
+            "interface Gi1",
+            " ip access-group OLD in",
+            "ip access-list extended OLD",
+            " permit ip any any",
+        ]
+        intended = [
+            "interface Gi1",
+            " ip access-group NEW in",
+            "ip access-list extended NEW",
+            " permit tcp any any eq 22",
+        ]
+        assert config_delta(running, intended) == [
+            "ip access-list extended NEW",
+            " permit tcp any any eq 22",
+            "interface Gi1",
+            " no ip access-group OLD in",
+            " ip access-group NEW in",
+            "no ip access-list extended OLD",
+        ]
+
+    def test_custom_negate_prefix(self):
+        assert config_delta(["set a 1"], ["set a 2"], negate_prefix="unset") == [
+            "unset set a 1",
+            "set a 2",
+        ]
+
+    def test_custom_negate_function(self):
+        delta = config_delta(
+            ["set a 1"], [], negate=lambda line: "delete " + line.removeprefix("set ")
+        )
+        assert delta == ["delete a 1"]
+
+    def test_large_config_is_fast(self):
+        running = []
+        for i in range(25_000):
+            running += [f"interface Vlan{i}", f" description v{i}", " no shutdown"]
+            running.append(f"ip route 10.{i // 256}.{i % 256}.0 255.255.255.0 Null0")
+        intended = list(running)
+        intended[1] = " description changed"
+        start = time.perf_counter()
+        delta = config_delta(running, intended)
+        assert time.perf_counter() - start < 5
+        assert delta == ["interface Vlan0", " description changed"]
+
+
+ACL = [
+    "ip access-list extended EDGE",
+    " deny ip any host 1.1.1.1",
+    " permit ip any any",
+]
+
+
+class TestOrderedSections:
+    def test_reorder_replaces_section(self):
+        intended = [ACL[0], ACL[2], ACL[1]]
+        assert config_delta(ACL, intended) == [
+            "no ip access-list extended EDGE",
+            "ip access-list extended EDGE",
+            " permit ip any any",
+            " deny ip any host 1.1.1.1",
+        ]
+
+    def test_mid_section_insert_replaces_section(self):
+        intended = [ACL[0], ACL[1], " deny ip any host 2.2.2.2", ACL[2]]
+        assert config_delta(ACL, intended) == [
+            "no ip access-list extended EDGE",
+            "ip access-list extended EDGE",
+            " deny ip any host 1.1.1.1",
+            " deny ip any host 2.2.2.2",
+            " permit ip any any",
+        ]
+
+    def test_append_and_remove_stay_incremental(self):
+        intended = [ACL[0], ACL[2], " deny ip any host 3.3.3.3"]
+        assert config_delta(ACL, intended) == [
+            "ip access-list extended EDGE",
+            " no deny ip any host 1.1.1.1",
+            " deny ip any host 3.3.3.3",
+        ]
+
+    def test_unordered_section_reorder_ignored(self):
+        running = ["interface Gi0/1", " description x", " no shutdown"]
+        intended = ["interface Gi0/1", " no shutdown", " description x"]
+        assert config_delta(running, intended) == []
+
+    def test_custom_ordered_sections(self):
+        running = ["route-map RM permit 10", " match a", " set b"]
+        intended = ["route-map RM permit 10", " set b", " match a"]
+        assert config_delta(running, intended) == []
+        assert config_delta(running, intended, ordered_sections=[r"^route-map "])[0] == (
+            "no route-map RM permit 10"
+        )
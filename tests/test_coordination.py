@@ -0,0 +1,220 @@
+"""Tests for coordination module."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import subprocess
+import sys
+
+import pytest
+import pytest_asyncio
+
+from mcp_network_common import coordination
+from mcp_network_common.coordination import (
+    CoordinatorServer,
+    LocalCoordinator,
+    SocketCoordinator,
+    get_coordinator,
+)
+from mcp_network_common.session import SessionTracker
+
+
+@pytest_asyncio.fixture
+async def server(tmp_path):
+    srv = CoordinatorServer(str(tmp_path / "coord.sock"))
+    await srv.start()
+    yield srv
+    await srv.close()
+
+
+class TestLocalCoordinator:
+    @pytest.mark.asyncio
+    async def test_semaphore_limits_holders(self):
+        coord = LocalCoordinator()
+        await coord.acquire("sw01", 1)
+        waiter = asyncio.create_task(coord.acquire("sw01", 1))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        await coord.release("sw01")
+        await asyncio.wait_for(waiter, 1)
+
+    @pytest.mark.asyncio
+    async def test_reserve_token_bucket(self):
+        coord = LocalCoordinator()
+        assert await coord.reserve("sw01", rate=10, burst=2) == 0
+        assert await coord.reserve("sw01", rate=10, burst=2) == 0
+        assert await coord.reserve("sw01", rate=10, burst=2) == pytest.approx(0.1, abs=0.01)
+        assert await coord.reserve("sw01", rate=10, burst=2) == pytest.approx(0.2, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_cache_ttl_and_lru(self):
+        coord = LocalCoordinator(max_cache_entries=2)
+        await coord.cache_set("a", {"out": 1})
+        await coord.cache_set("b", 2, ttl=-1)
+        assert await coord.cache_get("a") == {"out": 1}
+        assert await coord.cache_get("b") is None
+        await coord.cache_set("c", 3)
+        await coord.cache_set("d", 4)
+        assert await coord.cache_get("a") is None
+        assert await coord.cache_get("d") == 4
+
+
+class TestCoordinatorServer:
+    @pytest.mark.asyncio
+    async def test_second_server_on_same_path_refused(self, server):
+        with pytest.raises(RuntimeError, match="already running"):
+            await CoordinatorServer(server.path).start()
+        client = SocketCoordinator(server.path)
+        try:
+            await client.cache_set("k", 1)
+            assert await server.state.cache_get("k") == 1
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_with_connected_clients(self, tmp_path, caplog):
+        srv = CoordinatorServer(str(tmp_path / "coord.sock"))
+        await srv.start()
+        a, b = SocketCoordinator(srv.path), SocketCoordinator(srv.path)
+        try:
+            await a.acquire("sw01", 1)
+            waiter = asyncio.create_task(b.acquire("sw01", 1))
+            await asyncio.sleep(0.05)
+            await asyncio.wait_for(srv.close(), 1)
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(waiter, 1)
+            with pytest.raises(OSError):  # reconnect finds no socket
+                await a.cache_get("k")
+        finally:
+            await a.close()
+            await b.close()
+        assert "Traceback" not in caplog.text
+        assert "Exception in callback" not in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_stale_socket_replaced(self, tmp_path):
+        path = str(tmp_path / "coord.sock")
+        first = CoordinatorServer(path)
+        await first.start()
+        first._server.close()  # simulate a crash: socket file left behind
+        first._unlock()
+        second = CoordinatorServer(path)
+        await second.start()
+        await second.close()
+
+    @pytest.mark.asyncio
+    async def test_unexpected_errors_are_answered(self, server, monkeypatch):
+        async def broken(key: str) -> None:
+            raise RuntimeError("state broken")
+
+        monkeypatch.setattr(server.state, "cache_get", broken)
+        client = SocketCoordinator(server.path)
+        try:
+            with pytest.raises(RuntimeError, match="state broken"):
+                await asyncio.wait_for(client.cache_get("k"), 1)
+        finally:
+            await client.close()
+
+        reader, writer = await asyncio.open_unix_connection(server.path)
+        try:
+            writer.write(b"[1]\n")
+            writer.write(b'{"id": 7, "op": "cache_get", "key": "k"}\n')
+            reply = json.loads(await asyncio.wait_for(reader.readline(), 1))
+            assert reply == {"id": 7, "error": "state broken"}
+        finally:
+            writer.close()
+
+
+class TestSocketCoordinator:
+    @pytest.mark.asyncio
+    async def test_semaphore_shared_between_clients(self, server):
+        a, b = SocketCoordinator(server.path), SocketCoordinator(server.path)
+        try:
+            await a.acquire("sw01", 1)
+            waiter = asyncio.create_task(b.acquire("sw01", 1))
+            await asyncio.sleep(0.05)
+            assert not waiter.done()
+            await a.release("sw01")
+            await asyncio.wait_for(waiter, 1)
+        finally:
+            await a.close()
+            await b.close()
+
+    @pytest.mark.asyncio
+    async def test_disconnect_releases_held_slots(self, server):
+        a, b = SocketCoordinator(server.path), SocketCoordinator(server.path)
+        try:
+            await a.acquire("sw01", 1)
+            waiter = asyncio.create_task(b.acquire("sw01", 1))
+            await a.close()
+            await asyncio.wait_for(waiter, 1)
+        finally:
+            await b.close()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_acquire_gives_slot_back(self, server):
+        a, b = SocketCoordinator(server.path), SocketCoordinator(server.path)
+        try:
+            await a.acquire("sw01", 1)
+            waiter = asyncio.create_task(b.acquire("sw01", 1))
+            await asyncio.sleep(0.05)
+            waiter.cancel()
+            await a.release("sw01")
+            await asyncio.wait_for(a.acquire("sw01", 1), 1)
+        finally:
+            await a.close()
+            await b.close()
+
+    @pytest.mark.asyncio
+    async def test_cache_and_rate_limit_shared(self, server):
+        a, b = SocketCoordinator(server.path), SocketCoordinator(server.path)
+        try:
+            await a.cache_set("sw01:show version", {"output": "IOS XE"}, ttl=60)
+            assert await b.cache_get("sw01:show version") == {"output": "IOS XE"}
+            assert await b.cache_get("missing") is None
+            await a.throttle("sw01", rate=1000)
+            assert await b.reserve("sw01", rate=1000) > 0
+        finally:
+            await a.close()
+            await b.close()
+
+    @pytest.mark.asyncio
+    async def test_session_tracker_budget_spans_clients(self, server):
+        a, b = SocketCoordinator(server.path), SocketCoordinator(server.path)
+        first, second = SessionTracker(coordinator=a), SessionTracker(coordinator=b)
+        try:
+            second_slot = second.slot("sw01", 1)
+            async with first.slot("sw01", 1):
+                waiter = asyncio.create_task(second_slot.__aenter__())
+                await asyncio.sleep(0.05)
+                assert second.waiting("sw01") == 1
+            await asyncio.wait_for(waiter, 1)
+            assert second.open_sessions("sw01") == 1
+            await second_slot.__aexit__(None, None, None)
+        finally:
+            await a.close()
+            await b.close()
+
+
+class TestGetCoordinator:
+    def test_import_without_fcntl(self):
+        # asyncssh is preloaded: it imports fcntl itself on POSIX only.
+        code = (
+            "import sys, asyncssh; sys.modules['fcntl'] = None; "
+            "import asyncio, mcp_network_common as m; "
+            "asyncio.run(m.get_coordinator().acquire('k', 1))"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True, env={"PATH": ""})
+
+    def test_local_fallback(self, monkeypatch):
+        monkeypatch.delenv("MCP_COORDINATOR_SOCKET", raising=False)
+        monkeypatch.setattr(coordination, "_coordinator", None)
+        assert isinstance(get_coordinator(), LocalCoordinator)
+
+    def test_socket_when_configured(self, monkeypatch):
+        monkeypatch.setenv("MCP_COORDINATOR_SOCKET", "/tmp/mcp.sock")
+        monkeypatch.setattr(coordination, "_coordinator", None)
+        coord = get_coordinator()
+        assert isinstance(coord, SocketCoordinator)
+        assert coord.path == "/tmp/mcp.sock"
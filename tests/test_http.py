@@ -8,6 +8,7 @@ import os
 import pytest
 
 from mcp_network_common.http import create_http_client, handle_http_errors
+from mcp_network_common.http_cache import CachingTransport, ResponseCache
 
 
 class TestCreateHttpClient:
@@ -66,3 +67,11 @@ class TestHandleHttpErrors:
         result = await my_tool("fw01")
         parsed = json.loads(result)
         assert parsed["status"] == "error"
+
+
+class TestCreateHttpClientCache:
+    def test_cache_installs_caching_transport(self):
+        cache = ResponseCache()
+        client = create_http_client(cache=cache)
+        assert isinstance(client._transport, CachingTransport)
+        assert client._transport.cache is cache
@@ -0,0 +1,210 @@
+"""Tests for http_cache module."""
+
+from __future__ import annotations
+
+import os
+import stat
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from mcp_network_common.http_cache import CachingTransport, ResponseCache
+
+
+def make_client(handler, cache: ResponseCache) -> httpx.AsyncClient:
+    transport = CachingTransport(httpx.MockTransport(handler), cache)
+    return httpx.AsyncClient(base_url="https://ctrl.example", transport=transport)
+
+
+class Upstream:
+    """Mock controller that counts requests and honours If-None-Match."""
+
+    def __init__(self, headers: dict[str, str]) -> None:
+        self.headers = headers
+        self.calls: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls.append(request)
+        etag = self.headers.get("ETag")
+        if etag and request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, headers=self.headers, json={"devices": ["sw01"]})
+
+
+class TestCachingTransport:
+    @pytest.mark.asyncio
+    async def test_fresh_entry_served_without_network(self):
+        upstream = Upstream({"Cache-Control": "max-age=60"})
+        cache = ResponseCache()
+        async with make_client(upstream, cache) as client:
+            first = await client.get("/devices")
+            second = await client.get("/devices")
+        assert len(upstream.calls) == 1
+        assert second.json() == first.json() == {"devices": ["sw01"]}
+        assert second.extensions["from_cache"] is True
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_revalidated_with_etag(self):
+        upstream = Upstream({"ETag": '"v1"', "Cache-Control": "no-cache"})
+        cache = ResponseCache()
+        async with make_client(upstream, cache) as client:
+            await client.get("/devices")
+            second = await client.get("/devices")
+        assert len(upstream.calls) == 2
+        assert upstream.calls[1].headers["if-none-match"] == '"v1"'
+        assert second.status_code == 200
+        assert second.json() == {"devices": ["sw01"]}
+        assert cache.stats()["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_request_max_age_forces_revalidation(self):
+        upstream = Upstream({"ETag": '"v1"', "Cache-Control": "max-age=60"})
+        cache = ResponseCache()
+        async with make_client(upstream, cache) as client:
+            await client.get("/devices")
+            lenient = await client.get("/devices", headers={"Cache-Control": "max-age=3600"})
+            forced = await client.get("/devices", headers={"Cache-Control": "max-age=0"})
+        assert lenient.extensions["from_cache"] is True
+        assert len(upstream.calls) == 2
+        assert upstream.calls[1].headers["if-none-match"] == '"v1"'
+        assert forced.json() == {"devices": ["sw01"]}
+        assert cache.stats()["revalidated"] == 1
+
+    @pytest.mark.asyncio
+    async def test_age_header_reduces_freshness(self):
+        upstream = Upstream({"ETag": '"v1"', "Cache-Control": "max-age=60", "Age": "60"})
+        cache = ResponseCache()
+        async with make_client(upstream, cache) as client:
+            await client.get("/devices")
+            await client.get("/devices")
+        assert len(upstream.calls) == 2
+        assert cache.stats()["hits"] == 0
+
+        upstream = Upstream({"Cache-Control": "max-age=60", "Age": "30"})
+        async with make_client(upstream, ResponseCache()) as client:
+            await client.get("/devices")
+            second = await client.get("/devices")
+        assert len(upstream.calls) == 1
+        assert second.extensions["from_cache"] is True
+
+    @pytest.mark.asyncio
+    async def test_last_modified_sent_as_if_modified_since(self):
+        lm = "Wed, 21 Oct 2015 07:28:00 GMT"
+        upstream = Upstream({"Last-Modified": lm})
+        async with make_client(upstream, ResponseCache()) as client:
+            await client.get("/devices")
+            await client.get("/devices")
+        assert upstream.calls[1].headers["if-modified-since"] == lm
+
+    @pytest.mark.asyncio
+    async def test_no_store_not_cached(self):
+        upstream = Upstream({"Cache-Control": "no-store, max-age=60"})
+        cache = ResponseCache()
+        async with make_client(upstream, cache) as client:
+            await client.get("/devices")
+            await client.get("/devices")
+        assert len(upstream.calls) == 2
+        assert cache.stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unsafe_method_invalidates(self):
+        upstream = Upstream({"Cache-Control": "max-age=60"})
+        async with make_client(upstream, ResponseCache()) as client:
+            await client.get("/devices")
+            await client.post("/devices", json={})
+            await client.get("/devices")
+        assert [r.method for r in upstream.calls] == ["GET", "POST", "GET"]
+
+    @pytest.mark.asyncio
+    async def test_auth_is_part_of_key(self):
+        upstream = Upstream({"Cache-Control": "max-age=60"})
+        async with make_client(upstream, ResponseCache()) as client:
+            await client.get("/devices", auth=("a", "x"))
+            await client.get("/devices", auth=("b", "y"))
+        assert len(upstream.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_token_header_and_cookie_are_part_of_key(self):
+        upstream = Upstream({"Cache-Control": "max-age=60"})
+        async with make_client(upstream, ResponseCache()) as client:
+            await client.get("/devices", headers={"X-Auth-Token": "alice"})
+            await client.get("/devices", headers={"X-Auth-Token": "bob"})
+            await client.get("/devices", headers={"Cookie": "JSESSIONID=alice"})
+            await client.get("/devices", headers={"Cookie": "JSESSIONID=bob"})
+            await client.get("/devices", headers={"Cookie": "JSESSIONID=bob"})
+        assert len(upstream.calls) == 4
+
+    @pytest.mark.asyncio
+    async def test_custom_credential_header(self):
+        upstream = Upstream({"Cache-Control": "max-age=60"})
+        transport = CachingTransport(
+            httpx.MockTransport(upstream), ResponseCache(), credential_headers=["X-Session"]
+        )
+        async with httpx.AsyncClient(base_url="https://ctrl.example", transport=transport) as c:
+            await c.get("/devices", headers={"X-Session": "a"})
+            await c.get("/devices", headers={"X-Session": "b"})
+        assert len(upstream.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_vary_header_mismatch_misses(self):
+        upstream = Upstream({"Cache-Control": "max-age=60", "Vary": "Accept"})
+        async with make_client(upstream, ResponseCache()) as client:
+            await client.get("/devices", headers={"Accept": "application/json"})
+            await client.get("/devices", headers={"Accept": "application/json"})
+            await client.get("/devices", headers={"Accept": "text/xml"})
+        assert len(upstream.calls) == 2
+
+
+class TestResponseCache:
+    def _entry(self, body: bytes = b"x") -> dict:
+        return {"status": 200, "headers": [], "body": body, "stored_at": 0.0, "vary": {}}
+
+    def test_lru_eviction_by_entries(self):
+        cache = ResponseCache(max_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, self._entry())
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+    def test_eviction_by_bytes(self):
+        cache = ResponseCache(max_bytes=10)
+        cache.put("a", self._entry(b"123456"))
+        cache.put("b", self._entry(b"123456"))
+        assert cache.get("a") is None
+        assert cache.stats()["entries"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_new_cache(self, tmp_path):
+        upstream = Upstream({"Cache-Control": "max-age=60"})
+        async with make_client(upstream, ResponseCache(directory=str(tmp_path))) as client:
+            await client.get("/devices")
+        cache = ResponseCache(directory=str(tmp_path))
+        async with make_client(upstream, cache) as client:
+            resp = await client.get("/devices")
+        assert len(upstream.calls) == 1
+        assert resp.json() == {"devices": ["sw01"]}
+        assert cache.stats()["hits"] == 1
+
+    def test_disk_tier_bounded(self, tmp_path):
+        cache = ResponseCache(directory=str(tmp_path), max_disk_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, self._entry())
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+    def test_disk_tier_is_owner_only(self, tmp_path):
+        directory = tmp_path / "cache"
+        cache = ResponseCache(directory=str(directory))
+        cache.put("a", self._entry())
+        assert stat.S_IMODE(os.stat(directory).st_mode) & 0o077 == 0
+        (entry_file,) = directory.glob("*.json")
+        assert stat.S_IMODE(os.stat(entry_file).st_mode) == 0o600
+
+    def test_disk_write_error_is_logged_not_raised(self, tmp_path, caplog):
+        cache = ResponseCache(directory=str(tmp_path))
+        with patch("mcp_network_common.http_cache.os.open", side_effect=OSError("disk full")):
+            cache.put("a", self._entry())
+        assert cache.get("a") is not None
+        assert "disk full" in caplog.text
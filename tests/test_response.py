@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
+import tracemalloc
 
-from mcp_network_common.response import error_response, json_dumps, ok_response
+import pytest
+
+from mcp_network_common.response import (
+    NdjsonResponse,
+    error_response,
+    json_dumps,
+    json_line,
+    ok_response,
+    stream_responses,
+)
 
 
 class TestJsonDumps:
@@ -49,3 +60,134 @@ class TestErrorResponse:
         result = json.loads(error_response(ValueError("bad value")))
         assert result["status"] == "error"
         assert "bad value" in result["error"]
+
+
+class TestJsonLine:
+    def test_compact_and_newline_terminated(self):
+        line = json_line({"a": 1, "b": [1, 2]})
+        assert line == '{"a":1,"b":[1,2]}\n'
+
+    def test_default_str_for_non_serializable(self):
+        assert isinstance(json.loads(json_line({"obj": object()}))["obj"], str)
+
+
+class TestNdjsonResponse:
+    def test_records_and_summary(self):
+        stream = NdjsonResponse(slowest=2)
+        ok = json.loads(stream.ok("sw01", elapsed=1.0, output="x"))
+        err = json.loads(stream.error("sw02", ValueError("timeout"), elapsed=3.0))
+        stream.ok("sw03", elapsed=2.0)
+        summary = json.loads(stream.summary())
+
+        assert ok == {"status": "ok", "device": "sw01", "elapsed": 1.0, "output": "x"}
+        assert err["status"] == "error"
+        assert err["error"] == "timeout"
+        assert summary["status"] == "summary"
+        assert (summary["total"], summary["ok"], summary["error"]) == (3, 2, 1)
+        assert [s["device"] for s in summary["slowest"]] == ["sw02", "sw03"]
+        assert summary["errors"] == [{"device": "sw02", "error": "timeout"}]
+
+    def test_errors_bounded(self):
+        stream = NdjsonResponse(max_errors=2)
+        for i in range(5):
+            stream.error(f"d{i}", "boom")
+        summary = json.loads(stream.summary())
+        assert summary["error"] == 5
+        assert len(summary["errors"]) == 2
+        assert summary["errors_truncated"] is True
+
+
+class TestStreamResponses:
+    @pytest.mark.asyncio
+    async def test_yields_in_completion_order_then_summary(self):
+        async def run(delay: float, value: str) -> str:
+            await asyncio.sleep(delay)
+            return value
+
+        async def fail() -> str:
+            raise RuntimeError("unreachable")
+
+        lines = [
+            json.loads(line)
+            async for line in stream_responses(
+                {"slow": run(0.05, "a"), "fast": run(0, "b"), "bad": fail()}
+            )
+        ]
+        records = {r["device"]: r for r in lines[:3]}
+        assert lines[2]["device"] == "slow"
+        assert records["fast"]["result"] == "b"
+        assert records["bad"]["error"] == "unreachable"
+        assert lines[-1]["status"] == "summary"
+        assert lines[-1]["slowest"][0]["device"] == "slow"
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        running = peak = 0
+
+        async def run() -> None:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        lines = [
+            line
+            async for line in stream_responses({f"d{i}": run() for i in range(6)}, concurrency=2)
+        ]
+        assert len(lines) == 7
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_consumer_stop_cancels_remaining(self):
+        cancelled = asyncio.Event()
+
+        async def hang() -> None:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def quick() -> str:
+            return "ok"
+
+        gen = stream_responses({"quick": quick(), "hang": hang()})
+        assert json.loads(await gen.__anext__())["device"] == "quick"
+        await gen.aclose()
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+    @pytest.mark.asyncio
+    async def test_yielded_lines_are_released(self):
+        async def run() -> str:
+            await asyncio.sleep(0)
+            return "x" * 20_000
+
+        results = {f"d{i}": run() for i in range(200)}
+        tracemalloc.start()
+        try:
+            count = 0
+            async for _ in stream_responses(results, concurrency=4):
+                count += 1
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        assert count == 201
+        # 200 x 20 KB = 4 MB of output; only the in-flight few are ever held.
+        assert peak < 500_000
+
+    @pytest.mark.asyncio
+    async def test_consumer_stop_closes_unstarted(self):
+        started = []
+
+        async def run(device: str) -> str:
+            started.append(device)
+            return device
+
+        results = {f"d{i}": run(f"d{i}") for i in range(5)}
+        gen = stream_responses(results, concurrency=1)
+        await gen.__anext__()
+        await gen.aclose()
+        await asyncio.sleep(0)  # let the cancelled in-flight task unwind
+        assert len(started) <= 2
+        assert all(aw.cr_frame is None for aw in results.values())
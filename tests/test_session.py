@@ -0,0 +1,134 @@
+"""Tests for session module."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from mcp_network_common.coordination import LocalCoordinator
+from mcp_network_common.inventory import load_inventory
+from mcp_network_common.session import SessionTracker, open_device
+
+DEVICES = {
+    "sw01": {"host": "10.0.0.1", "platform": "cisco_iosxe", "max_sessions": 2},
+    "api01": {"host": "10.0.0.2", "transport": "https", "username": "admin"},
+    "api02": {"host": "10.0.0.5", "transport": "https", "http_port": 8443},
+    "bad": {"host": "10.0.0.3", "transport": "telnet"},
+    "noplat": {"host": "10.0.0.4"},
+}
+
+
+def make_tracker() -> SessionTracker:
+    # A private coordinator keeps budgets from leaking between tests.
+    return SessionTracker(coordinator=LocalCoordinator())
+
+
+class TestSessionTracker:
+    @pytest.mark.asyncio
+    async def test_counts_open_sessions(self):
+        tracker = make_tracker()
+        async with tracker.slot("sw01"):
+            assert tracker.open_sessions("sw01") == 1
+        assert tracker.open_sessions("sw01") == 0
+
+    @pytest.mark.asyncio
+    async def test_queues_over_budget(self):
+        tracker = make_tracker()
+        release = asyncio.Event()
+        peak = 0
+
+        async def worker():
+            nonlocal peak
+            async with tracker.slot("sw01", 2):
+                peak = max(peak, tracker.open_sessions("sw01"))
+                await release.wait()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert tracker.stats() == {"sw01": {"open": 2, "waiting": 3}}
+        release.set()
+        await asyncio.gather(*tasks)
+        assert peak == 2
+        assert tracker.stats() == {"sw01": {"open": 0, "waiting": 0}}
+
+
+class TestOpenDevice:
+    @pytest.mark.asyncio
+    async def test_ssh_session_closed_on_exit(self):
+        tracker = make_tracker()
+        with patch("mcp_network_common.ssh.AsyncScrapli") as MockScrapli:
+            mock_conn = AsyncMock()
+            MockScrapli.return_value = mock_conn
+            async with open_device("sw01", DEVICES, tracker=tracker) as conn:
+                assert conn is mock_conn
+                assert tracker.open_sessions("sw01") == 1
+            assert MockScrapli.call_args[1]["platform"] == "cisco_iosxe"
+            mock_conn.close.assert_awaited_once()
+        assert tracker.open_sessions("sw01") == 0
+
+    @pytest.mark.asyncio
+    async def test_ssh_session_closed_on_error(self):
+        with patch("mcp_network_common.ssh.AsyncScrapli") as MockScrapli:
+            mock_conn = AsyncMock()
+            MockScrapli.return_value = mock_conn
+            with pytest.raises(RuntimeError):
+                async with open_device("sw01", DEVICES, tracker=make_tracker()):
+                    raise RuntimeError("boom")
+            mock_conn.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_session_closed_on_cancel(self):
+        tracker = make_tracker()
+        entered = asyncio.Event()
+        with patch("mcp_network_common.ssh.AsyncScrapli") as MockScrapli:
+            mock_conn = AsyncMock()
+            MockScrapli.return_value = mock_conn
+
+            async def use():
+                async with open_device("sw01", DEVICES, tracker=tracker):
+                    entered.set()
+                    await asyncio.sleep(60)
+
+            task = asyncio.create_task(use())
+            await entered.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            mock_conn.close.assert_awaited_once()
+        assert tracker.open_sessions("sw01") == 0
+
+    @pytest.mark.asyncio
+    async def test_http_transport(self):
+        async with open_device("api01", DEVICES, tracker=make_tracker()) as client:
+            assert isinstance(client, httpx.AsyncClient)
+            assert str(client.base_url) == "https://10.0.0.2"
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_http_transport_uses_explicit_port(self):
+        async with open_device("api02", DEVICES, tracker=make_tracker()) as client:
+            assert str(client.base_url) == "https://10.0.0.5:8443"
+
+    @pytest.mark.asyncio
+    async def test_http_transport_ignores_ssh_port(self, monkeypatch):
+        monkeypatch.setenv("TESTDEV_HOST", "10.0.0.6")
+        devices: dict = {}
+        load_inventory("TESTDEV", devices, default_fields={"transport": "https"})
+        assert devices["default"]["port"] == 22
+        async with open_device("default", devices, tracker=make_tracker()) as client:
+            assert str(client.base_url) == "https://10.0.0.6"
+
+    @pytest.mark.asyncio
+    async def test_unsupported_transport(self):
+        with pytest.raises(ValueError, match="Unsupported transport"):
+            async with open_device("bad", DEVICES, tracker=make_tracker()):
+                pass
+
+    @pytest.mark.asyncio
+    async def test_missing_platform(self):
+        with pytest.raises(ValueError, match="platform"):
+            async with open_device("noplat", DEVICES, tracker=make_tracker()):
+                pass
@@ -5,9 +5,13 @@ from __future__ import annotations
 import json
 from unittest.mock import AsyncMock, patch
 
+import asyncssh
 import pytest
+import pytest_asyncio
+from scrapli.exceptions import ScrapliAuthenticationFailed
 
-from mcp_network_common.ssh import create_scrapli_conn, handle_ssh_errors
+from mcp_network_common import ssh
+from mcp_network_common.ssh import KnownHostsStore, create_scrapli_conn, handle_ssh_errors
 
 
 class TestHandleSshErrors:
@@ -79,3 +83,208 @@ class TestCreateScrapliConn:
 
             call_kwargs = MockScrapli.call_args[1]
             assert call_kwargs["port"] == 2222
+
+    @pytest.mark.asyncio
+    async def test_closes_connection_when_open_fails(self):
+        device = {"host": "10.0.0.1"}
+
+        with patch("mcp_network_common.ssh.AsyncScrapli") as MockScrapli:
+            mock_conn = AsyncMock()
+            mock_conn.open.side_effect = OSError("refused")
+            MockScrapli.return_value = mock_conn
+
+            with pytest.raises(OSError):
+                await create_scrapli_conn(device, platform="linux")
+            mock_conn.close.assert_awaited_once()
+
+
+class TestKnownHostsStore:
+    def test_unknown_host_returns_none(self, tmp_path):
+        store = KnownHostsStore(str(tmp_path / "known_hosts"))
+        assert store.lookup("10.0.0.1") is None
+
+    def test_learn_then_lookup_persists(self, tmp_path):
+        path = tmp_path / "known_hosts"
+        key = asyncssh.generate_private_key("ssh-ed25519")
+        KnownHostsStore(str(path)).learn("10.0.0.1", 2222, key)
+
+        assert path.read_text().startswith("[10.0.0.1]:2222 ssh-ed25519 ")
+        store = KnownHostsStore(str(path))
+        assert store.lookup("10.0.0.1", 2222) is not None
+        assert store.lookup("10.0.0.1", 22) is None
+
+    def test_path_from_env(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("MCP_SSH_KNOWN_HOSTS", str(tmp_path / "kh"))
+        assert KnownHostsStore().path == str(tmp_path / "kh")
+
+
+class TestCreateScrapliConnFastPath:
+    @pytest.mark.asyncio
+    async def test_default_mode_sets_no_transport_options(self):
+        with patch("mcp_network_common.ssh.AsyncScrapli") as MockScrapli:
+            MockScrapli.return_value = AsyncMock()
+            await create_scrapli_conn({"host": "10.0.0.1"}, platform="cisco_iosxe")
+            assert MockScrapli.call_args[1]["transport_options"] == {}
+
+    @pytest.mark.asyncio
+    async def test_reads_options_from_inventory_and_learns_key(self, tmp_path):
+        client_key = asyncssh.generate_private_key("ssh-ed25519")
+        device = {
+            "host": "10.0.0.1",
+            "kex_algs": ["curve25519-sha256"],
+            "encryption_algs": ["aes128-gcm@openssh.com"],
+            "private_key": str(tmp_path / "id"),
+            "private_key_passphrase": "hunter2",
+        }
+        client_key.write_private_key(str(tmp_path / "id"), passphrase="hunter2")
+        store = KnownHostsStore(str(tmp_path / "known_hosts"))
+        server_key = asyncssh.generate_private_key("ssh-ed25519")
+
+        with patch("mcp_network_common.ssh.AsyncScrapli") as MockScrapli:
+            mock_conn = AsyncMock()
+            mock_conn.transport.session.get_server_host_key = lambda: server_key
+            MockScrapli.return_value = mock_conn
+
+            options = []
+            for _ in range(3):
+                await create_scrapli_conn(
+                    device, platform="cisco_iosxe", fast_path=True, known_hosts=store
+                )
+                options.append(MockScrapli.call_args[1]["transport_options"]["asyncssh"])
+
+        first, second, third = options
+        assert first["options"].kex_algs == [b"curve25519-sha256"]
+        assert first["options"].encryption_algs == [b"aes128-gcm@openssh.com"]
+        assert first["known_hosts"] is None
+        assert second["known_hosts"] is not None
+        # Once the host key is learned, the same options object is reused.
+        assert third["options"] is second["options"]
+        assert third["client_keys"] == first["client_keys"]
+        # The entry built before the key was learned is replaced, not kept.
+        keys = [k for k in ssh._connection_options if k[0] == "10.0.0.1"]
+        assert len(keys) == 1
+        assert "hunter2" not in keys[0]
+
+    def test_options_cache_is_bounded(self, monkeypatch):
+        monkeypatch.setattr(ssh, "_connection_options", ssh.OrderedDict())
+        monkeypatch.setattr(ssh, "MAX_CACHED_OPTIONS", 2)
+        for host in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            ssh._fast_path_options({"host": host}, 22, None)
+        assert [k[0] for k in ssh._connection_options] == ["10.0.0.2", "10.0.0.3"]
+
+    @pytest.mark.asyncio
+    async def test_host_key_mismatch_raises_auth_failed(self, tmp_path):
+        store = KnownHostsStore(str(tmp_path / "known_hosts"))
+        store.learn("10.0.0.1", 22, asyncssh.generate_private_key("ssh-ed25519"))
+
+        with patch("mcp_network_common.ssh.AsyncScrapli") as MockScrapli:
+            mock_conn = AsyncMock()
+            mock_conn.open.side_effect = asyncssh.HostKeyNotVerifiable("mismatch")
+            MockScrapli.return_value = mock_conn
+
+            with pytest.raises(ScrapliAuthenticationFailed, match="Host key"):
+                await create_scrapli_conn(
+                    {"host": "10.0.0.1"}, platform="cisco_iosxe", fast_path=True, known_hosts=store
+                )
+            mock_conn.close.assert_awaited_once()
+
+
+class _Server(asyncssh.SSHServer):
+    """Accepts password "secret" or the authorized client key."""
+
+    def begin_auth(self, username: str) -> bool:
+        return True
+
+    def password_auth_supported(self) -> bool:
+        return True
+
+    def validate_password(self, username: str, password: str) -> bool:
+        return password == "secret"
+
+
+async def _ios_shell(process: asyncssh.SSHServerProcess) -> None:
+    """Echo input and answer every line with an IOS-style prompt."""
+    process.stdout.write("router#")
+    try:
+        while ch := await process.stdin.read(1):
+            process.stdout.write("\nrouter#" if ch in "\r\n" else ch)
+    except (asyncssh.BreakReceived, asyncssh.TerminalSizeChanged, ConnectionError):
+        pass
+    process.exit(0)
+
+
+@pytest_asyncio.fixture
+async def ssh_server(tmp_path):
+    """In-process asyncssh server; yields (device, host_key)."""
+    host_key = asyncssh.generate_private_key("ssh-ed25519")
+    client_key = asyncssh.generate_private_key("ssh-ed25519")
+    client_key.write_private_key(str(tmp_path / "id"))
+    server = await asyncssh.create_server(
+        _Server,
+        "127.0.0.1",
+        0,
+        server_host_keys=[host_key],
+        authorized_client_keys=asyncssh.import_authorized_keys(
+            client_key.export_public_key().decode()
+        ),
+        process_factory=_ios_shell,
+        encoding="utf-8",
+    )
+    device = {
+        "host": "127.0.0.1",
+        "port": server.sockets[0].getsockname()[1],
+        "username": "admin",
+        "password": "secret",
+    }
+    yield device, host_key
+    server.close()
+    await server.wait_closed()
+
+
+class TestFastPathLocalServer:
+    @pytest.mark.asyncio
+    async def test_learns_host_key_then_verifies(self, ssh_server, tmp_path):
+        device, host_key = ssh_server
+        store = KnownHostsStore(str(tmp_path / "known_hosts"))
+
+        for _ in range(2):
+            conn = await create_scrapli_conn(
+                device, platform="cisco_iosxe", fast_path=True, known_hosts=store
+            )
+            await conn.close()
+
+        learned = (tmp_path / "known_hosts").read_text().splitlines()
+        assert len(learned) == 1
+        assert learned[0].split()[2] == host_key.export_public_key().decode().split()[1]
+
+    @pytest.mark.asyncio
+    async def test_key_auth_and_pinned_algorithms(self, ssh_server, tmp_path):
+        device, _ = ssh_server
+        device = {
+            **device,
+            "password": "wrong",
+            "private_key": str(tmp_path / "id"),
+            "kex_algs": ["curve25519-sha256"],
+            "encryption_algs": ["aes128-gcm@openssh.com"],
+            "server_host_key_algs": ["ssh-ed25519"],
+        }
+        store = KnownHostsStore(str(tmp_path / "known_hosts"))
+        conn = await create_scrapli_conn(
+            device, platform="cisco_iosxe", fast_path=True, known_hosts=store
+        )
+        try:
+            session = conn.transport.session
+            assert session.get_extra_info("send_cipher") == "aes128-gcm@openssh.com"
+        finally:
+            await conn.close()
+
+    @pytest.mark.asyncio
+    async def test_host_key_mismatch_refused(self, ssh_server, tmp_path):
+        device, _ = ssh_server
+        store = KnownHostsStore(str(tmp_path / "known_hosts"))
+        store.learn(device["host"], device["port"], asyncssh.generate_private_key("ssh-ed25519"))
+
+        with pytest.raises(ScrapliAuthenticationFailed, match="Host key"):
+            await create_scrapli_conn(
+                device, platform="cisco_iosxe", fast_path=True, known_hosts=store
+            )
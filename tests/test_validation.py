@@ -76,3 +76,41 @@ class TestCustomValidator:
         err = v.validate_config(["execute reboot"])
         assert err is not None
         assert v.validate_config(["config system global"]) is None
+
+
+class TestValidateConfigDelta:
+    def test_returns_only_changed_lines(self):
+        v = CommandValidator()
+        running = ["hostname r1", "interface Gi0/1", " shutdown"]
+        intended = ["hostname r1", "interface Gi0/1", " no shutdown"]
+        commands, err = v.validate_config_delta(running, intended)
+        assert err is None
+        assert commands == ["interface Gi0/1", " no shutdown"]
+
+    def test_blocks_dangerous_line_in_delta(self):
+        v = CommandValidator()
+        commands, err = v.validate_config_delta(["hostname r1"], ["hostname r1", "reload"])
+        assert commands == ["reload"]
+        assert err is not None
+
+    def test_uses_vendor_negate_prefix(self):
+        class VyosValidator(CommandValidator):
+            config_negate_prefix = "unset"
+
+        commands, err = VyosValidator().validate_config_delta(["hostname a"], [])
+        assert commands == ["unset hostname a"]
+        assert err is None
+
+    def test_vendor_negation_rewrite(self):
+        class JunosValidator(CommandValidator):
+            config_comment_prefixes = ("#",)
+            config_blocked_patterns = [(r"\brequest\s+system\s+reboot\b", "reboot")]
+
+            def negate_config_line(self, line: str) -> str:
+                return "delete " + line.removeprefix("set ")
+
+        running = ["# comment", "set system host-name a"]
+        intended = ["# other", "set system host-name b"]
+        commands, err = JunosValidator().validate_config_delta(running, intended)
+        assert commands == ["delete system host-name a", "set system host-name b"]
+        assert err is None